@@ -1,15 +1,18 @@
+import time
+IMPORT_START = time.perf_counter()
+
 import requests
-import smtplib
 import json
 import os
-import gspread
 from datetime import datetime
-from oauth2client.service_account import ServiceAccountCredentials
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-import time
 import random
 import re
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Sink dependencies (smtplib, gspread, oauth2client) are imported lazily by each sink
+IMPORT_SECONDS = round(time.perf_counter() - IMPORT_START, 3)
 
 # 🧠 Improved Filters
 KEYWORDS = [
@@ -34,6 +37,27 @@ SHEET_ID = os.getenv('SHEET_ID')
 CACHE_FILE = 'job_ids.json'
 GOOGLE_CREDS_FILE = 'sgpjobtracker-465403-99d56dd31314.json'
 
+# 📤 Optional output sinks
+JSON_OUTPUT_FILE = os.getenv('JSON_OUTPUT_FILE')  # e.g. 'job_report.json'
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')  # Stand-in for WhatsApp / chat notifications
+SINK_CHECK_TIMEOUT = 30  # Credential checks still running this long after starting are skipped
+
+# ⏱️ Run budget
+RUN_DEADLINE_SECONDS = int(os.getenv('RUN_DEADLINE_SECONDS', '600'))  # Whole fetch phase must fit in this
+REQUEST_TIMEOUT = 30  # Max timeout for a single request
+MIN_REQUEST_TIMEOUT = 5  # Below this a request is not worth starting
+HEDGE_DELAY_SECONDS = 10  # Send a hedged duplicate if a request is still running after this
+PAYLOAD_PAUSE_SECONDS = (2, 5)  # Random delay before each payload attempt
+COMPANY_PAUSE_SECONDS = (1, 3)  # Random delay between companies
+# Least a waiting tenant needs: one minimum request plus its worst-case pauses
+TENANT_MIN_COST = MIN_REQUEST_TIMEOUT + PAYLOAD_PAUSE_SECONDS[1] + COMPANY_PAUSE_SECONDS[1]
+
+# Higher priority tenants are fetched first; unlisted companies default to 0
+COMPANY_PRIORITIES = {
+    "S&P Global": 10,
+}
+DEFAULT_PRIORITY = 0
+
 # 🔗 Updated Workday Job APIs with proper headers and request structure
 COMPANY_SOURCES = {
     "S&P Global": {
@@ -115,22 +139,95 @@ class ScrapingStatus:
             'last_updated': datetime.now().strftime('%H:%M:%S')
         })
     
+    def set_deferred(self, company, reason):
+        """Mark company as skipped because the run deadline was reached"""
+        self.status[company].update({
+            'status': 'deferred',
+            'jobs_found': 0,
+            'error_message': str(reason)[:100],
+            'response_time': None,
+            'last_updated': datetime.now().strftime('%H:%M:%S')
+        })
+    
     def get_summary(self):
         """Get summary of scraping results"""
         success_count = sum(1 for s in self.status.values() if s['status'] == 'success')
         failed_count = sum(1 for s in self.status.values() if s['status'] == 'failed')
+        deferred_count = sum(1 for s in self.status.values() if s['status'] == 'deferred')
         total_jobs = sum(s['jobs_found'] for s in self.status.values())
         
         return {
             'total_companies': len(self.status),
             'successful': success_count,
             'failed': failed_count,
+            'deferred': deferred_count,
             'total_jobs_found': total_jobs
         }
 
+# ⏱️ Deadline-aware tenant scheduling
+class RunScheduler:
+    def __init__(self, deadline_seconds=RUN_DEADLINE_SECONDS):
+        self.deadline_seconds = deadline_seconds
+        self.start_time = time.monotonic()
+        self.current = None
+        self.waiting = []
+        self.requests_sent = 0
+    
+    def remaining(self):
+        """Seconds left before the run deadline"""
+        return max(0.0, self.deadline_seconds - (time.monotonic() - self.start_time))
+    
+    def iter_companies(self):
+        """Yield companies by priority, keeping config order for ties"""
+        ordered = sorted(COMPANY_SOURCES, key=lambda c: -company_priority(c))
+        for i, company in enumerate(ordered):
+            self.current = company
+            self.waiting = ordered[i + 1:]
+            yield company
+        self.current = None
+        self.waiting = []
+    
+    def reserve(self):
+        """Seconds held back for waiting tenants with the current tenant's priority.
+        
+        Lower-priority tenants get nothing held back, so a higher-priority
+        tenant can take up to REQUEST_TIMEOUT first. The reserve is only a
+        floor (TENANT_MIN_COST per peer); it does not promise every tenant fits.
+        """
+        if self.current is None:
+            return 0
+        current_priority = company_priority(self.current)
+        peers = sum(1 for c in self.waiting if company_priority(c) >= current_priority)
+        return TENANT_MIN_COST * peers
+    
+    def request_timeout(self):
+        """Timeout for the next request, or None if the budget is spent.
+        
+        The timeout shrinks as the budget is used up, and within a priority
+        tier earlier tenants leave room for their waiting peers.
+        """
+        remaining = self.remaining()
+        if remaining < MIN_REQUEST_TIMEOUT:
+            return None
+        budget = max(remaining - self.reserve(), MIN_REQUEST_TIMEOUT)
+        return round(min(REQUEST_TIMEOUT, budget), 2)
+    
+    def can_hedge(self, timeout):
+        """Only hedge if the duplicate request fits in the spare budget"""
+        return timeout >= MIN_REQUEST_TIMEOUT and self.remaining() - self.reserve() >= timeout
+    
+    def pause(self, seconds):
+        """Sleep for rate limiting without eating into the last request slot"""
+        # Keep a margin so request_timeout() still sees a full slot after waking
+        time.sleep(max(0.0, min(seconds, self.remaining() - MIN_REQUEST_TIMEOUT - 0.5)))
+
 # Global scraping status tracker
 scraping_status = ScrapingStatus()
 
+def company_priority(company):
+    """Priority of a company (higher is fetched and reported first)"""
+    return COMPANY_PRIORITIES.get(company, DEFAULT_PRIORITY)
+
 def debug_print(message):
     """Print debug messages only if DEBUG_MODE is enabled"""
     if DEBUG_MODE:
@@ -154,30 +251,6 @@ def get_headers():
         'Referer': 'https://careers.workday.com/'
     }
 
-def send_email(subject, html_body):
-    """Send HTML email with error handling"""
-    if not EMAIL_SENDER or not EMAIL_PASSWORD:
-        print("❌ Email credentials not configured")
-        return False
-        
-    msg = MIMEMultipart("alternative")
-    msg['From'] = EMAIL_SENDER
-    msg['To'] = EMAIL_RECEIVER
-    msg['Subject'] = subject
-    msg.attach(MIMEText(html_body, 'html'))
-
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(EMAIL_SENDER, EMAIL_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-        print("✅ Email sent successfully")
-        return True
-    except Exception as e:
-        print(f"❌ Email failed: {e}")
-        return False
-
 def load_seen_jobs():
     """Load previously seen job IDs from cache file"""
     if os.path.exists(CACHE_FILE):
@@ -198,18 +271,9 @@ def save_seen_jobs(ids):
     except Exception as e:
         print(f"❌ Failed to save cache: {e}")
 
-def log_to_sheet(jobs):
+def log_to_sheet(sheet, jobs):
     """Log new jobs to Google Sheets"""
-    if not SHEET_ID:
-        print("⚠️ Google Sheets not configured")
-        return
-        
     try:
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(GOOGLE_CREDS_FILE, scope)
-        client = gspread.authorize(creds)
-        sheet = client.open_by_key(SHEET_ID).sheet1
-        
         for job in jobs:
             sheet.append_row([
                 job['company'], 
@@ -220,8 +284,242 @@ def log_to_sheet(jobs):
                 datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             ])
         print(f"📄 Logged {len(jobs)} jobs to Google Sheets")
+        return True
     except Exception as e:
         print(f"⚠️ Google Sheet error: {e}")
+        return False
+
+# 📤 Output Sinks
+class OutputSink:
+    """Base class for report outputs.
+    
+    Subclasses import their dependencies in load() so disabled sinks cost
+    nothing at startup, and verify credentials in check() (raise on failure).
+    """
+    name = "sink"
+    primary = False  # Seen jobs are only saved once every primary sink has delivered
+    
+    def __init__(self):
+        self.ready = False
+        self.error = None
+        self.load_time = None
+        self.check_time = None
+    
+    def enabled(self):
+        """Whether this sink is configured for the run"""
+        return True
+    
+    def load(self):
+        """Import the sink's dependencies"""
+    
+    def check(self):
+        """Verify credentials/configuration before sending"""
+    
+    def send(self, report):
+        """Deliver the report, returning True on success"""
+        raise NotImplementedError
+    
+    def prepare(self):
+        """Load dependencies and check credentials, recording timings"""
+        start = time.perf_counter()
+        try:
+            self.load()
+            self.load_time = round(time.perf_counter() - start, 3)
+            self.check()
+            self.check_time = round(time.perf_counter() - start - self.load_time, 3)
+            self.ready = True
+            print(f"✅ {self.name} sink ready")
+        except Exception as e:
+            self.error = str(e)[:100]
+            print(f"❌ {self.name} sink not ready: {e}")
+        return self.ready
+
+class EmailSink(OutputSink):
+    name = "Email"
+    primary = True
+    
+    def enabled(self):
+        return bool(EMAIL_SENDER and EMAIL_PASSWORD)
+    
+    def load(self):
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+        self.smtplib = smtplib
+        self.MIMEText = MIMEText
+        self.MIMEMultipart = MIMEMultipart
+    
+    def check(self):
+        """Log in to Gmail without sending anything"""
+        server = self.smtplib.SMTP('smtp.gmail.com', 587, timeout=REQUEST_TIMEOUT)
+        try:
+            server.starttls()
+            server.login(EMAIL_SENDER, EMAIL_PASSWORD)
+        except Exception:
+            # close() just drops the socket, so it can't mask the real error like quit() can
+            server.close()
+            raise
+        server.quit()
+    
+    def send(self, report):
+        """Send HTML email with error handling"""
+        msg = self.MIMEMultipart("alternative")
+        msg['From'] = EMAIL_SENDER
+        msg['To'] = EMAIL_RECEIVER
+        msg['Subject'] = report['subject']
+        msg.attach(self.MIMEText(report['html_body'], 'html'))
+
+        try:
+            server = self.smtplib.SMTP('smtp.gmail.com', 587, timeout=REQUEST_TIMEOUT)
+            server.starttls()
+            server.login(EMAIL_SENDER, EMAIL_PASSWORD)
+            server.send_message(msg)
+            server.quit()
+            print("✅ Email sent successfully")
+            return True
+        except Exception as e:
+            print(f"❌ Email failed: {e}")
+            return False
+
+class SheetSink(OutputSink):
+    name = "Google Sheets"
+    
+    def enabled(self):
+        return bool(SHEET_ID)
+    
+    def load(self):
+        import gspread
+        from oauth2client.service_account import ServiceAccountCredentials
+        self.gspread = gspread
+        self.ServiceAccountCredentials = ServiceAccountCredentials
+    
+    def check(self):
+        """Authorize with Google and open the tracking sheet"""
+        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+        creds = self.ServiceAccountCredentials.from_json_keyfile_name(GOOGLE_CREDS_FILE, scope)
+        client = self.gspread.authorize(creds)
+        self.sheet = client.open_by_key(SHEET_ID).sheet1
+    
+    def send(self, report):
+        if not report['new_jobs']:
+            return True
+        return log_to_sheet(self.sheet, report['new_jobs'])
+
+class JsonFileSink(OutputSink):
+    name = "JSON file"
+    
+    def enabled(self):
+        return bool(JSON_OUTPUT_FILE)
+    
+    def check(self):
+        directory = os.path.dirname(os.path.abspath(JSON_OUTPUT_FILE))
+        if not os.access(directory, os.W_OK):
+            raise PermissionError(f"Cannot write to {directory}")
+    
+    def send(self, report):
+        with open(JSON_OUTPUT_FILE, 'w') as f:
+            json.dump(build_report_payload(report), f, indent=2)
+        print(f"💾 Wrote report to {JSON_OUTPUT_FILE}")
+        return True
+
+class WebhookSink(OutputSink):
+    name = "Webhook"
+    
+    def enabled(self):
+        return bool(WEBHOOK_URL)
+    
+    def check(self):
+        if not WEBHOOK_URL.startswith(('http://', 'https://')):
+            raise ValueError("WEBHOOK_URL must be an http(s) URL")
+    
+    def send(self, report):
+        response = requests.post(WEBHOOK_URL, json=build_report_payload(report), timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        print(f"🔔 Webhook notified ({response.status_code})")
+        return True
+
+OUTPUT_SINKS = [EmailSink, SheetSink, JsonFileSink, WebhookSink]
+
+def get_enabled_sinks():
+    """Instantiate every configured sink"""
+    sinks = [sink_class() for sink_class in OUTPUT_SINKS]
+    return [sink for sink in sinks if sink.enabled()]
+
+def build_report_payload(report):
+    """JSON-friendly version of the report for file and webhook sinks"""
+    return {
+        'subject': report['subject'],
+        'generated_at': report['generated_at'],
+        'summary': report['summary'],
+        'startup': report['startup'],
+        'scraping_status': scraping_status.status,
+        'new_jobs': report['new_jobs'],
+        'current_jobs': report['current_jobs']
+    }
+
+def dispatch_to_sinks(sinks, report):
+    """Send the report to all ready sinks in parallel, returning the ones that succeeded"""
+    if not sinks:
+        return []
+    
+    with ThreadPoolExecutor(max_workers=len(sinks)) as executor:
+        futures = {executor.submit(sink.send, report): sink for sink in sinks}
+    
+    delivered = []
+    for future, sink in futures.items():
+        try:
+            if future.result():
+                delivered.append(sink.name)
+        except Exception as e:
+            print(f"❌ {sink.name} sink failed: {e}")
+    return delivered
+
+def post_with_hedge(url, payload, headers, timeout, scheduler):
+    """POST a request, sending a hedged duplicate if the tenant is slow.
+    
+    The whole call is bounded by `timeout`, since the requests timeout only
+    limits connect and per-read time. Requests run on daemon threads so one
+    still trickling bytes after we give up can't hold up the process exit.
+    """
+    results = queue.Queue()
+    end_time = time.monotonic() + timeout
+    
+    def send(request_timeout):
+        try:
+            results.put((requests.post(url, json=payload, headers=headers, timeout=request_timeout), None))
+        except Exception as e:
+            results.put((None, e))
+    
+    def start(request_timeout):
+        threading.Thread(target=send, args=(request_timeout,), daemon=True).start()
+    
+    start(timeout)
+    in_flight = 1
+    hedge_at = time.monotonic() + HEDGE_DELAY_SECONDS
+    hedged = False
+    last_error = None
+    
+    # Return the first successful response; raise only if every request failed
+    while in_flight:
+        wait_until = end_time if hedged else min(hedge_at, end_time)
+        try:
+            response, error = results.get(timeout=max(0.0, wait_until - time.monotonic()))
+        except queue.Empty:
+            if time.monotonic() >= end_time:
+                raise TimeoutError(f"No response within {timeout}s")
+            hedged = True
+            hedge_timeout = round(end_time - time.monotonic(), 2)
+            if scheduler.can_hedge(hedge_timeout):
+                debug_print(f"🐢 Slow response, sending hedged request ({hedge_timeout}s timeout)")
+                start(hedge_timeout)
+                in_flight += 1
+            continue
+        
+        in_flight -= 1
+        if error is None:
+            return response
+        last_error = error
+    raise last_error
 
 def construct_job_url(company_data, job_id):
     """Construct proper job URL from job ID"""
@@ -352,7 +650,7 @@ def process_job(job, company, company_data):
         debug_print(f"⚠️ Error processing job: {e}")
         return None
 
-def fetch_jobs_from_company(company, company_data):
+def fetch_jobs_from_company(company, company_data, scheduler):
     """Fetch jobs from a single company with improved error handling and status tracking"""
     url = company_data['url']
     headers = get_headers()
@@ -379,14 +677,25 @@ def fetch_jobs_from_company(company, company_data):
     
     last_error = None
     response = None
+    attempts = 0
     
     for i, payload in enumerate(payloads):
+        # Add random delay to avoid rate limiting (nothing to space out before the run's first request)
+        if scheduler.requests_sent:
+            scheduler.pause(random.uniform(*PAYLOAD_PAUSE_SECONDS))
+        
+        timeout = scheduler.request_timeout()
+        if timeout is None:
+            last_error = last_error or "Run deadline reached"
+            debug_print(f"⏱️ No budget left for payload {i+1} for {company}")
+            continue
+        
+        attempts += 1
         try:
-            # Add random delay to avoid rate limiting
-            time.sleep(random.uniform(2, 5))
-            
-            debug_print(f"📡 Trying payload {i+1} for {company}")
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            debug_print(f"📡 Trying payload {i+1} for {company} ({timeout}s timeout)")
+            record_first_request()
+            scheduler.requests_sent += 1
+            response = post_with_hedge(url, payload, headers, timeout, scheduler)
             
             if response.status_code == 200:
                 data = response.json()
@@ -402,6 +711,11 @@ def fetch_jobs_from_company(company, company_data):
             debug_print(f"❌ Payload {i+1} failed with error: {e}")
             continue
     else:
+        if attempts == 0:
+            scraping_status.set_deferred(company, "Run deadline reached before first request")
+            print(f"⏭️ Deferred {company}: run deadline reached")
+            return []
+        
         # All payloads failed
         response_time = round(time.time() - start_time, 2)
         error_msg = f"All payloads failed. Last error: {last_error}"
@@ -458,12 +772,20 @@ def fetch_jobs():
     
     # Reset scraping status for new run
     scraping_status.reset_all()
+    scheduler = RunScheduler()
     
     print(f"🔍 Starting job search with {len(seen)} previously seen jobs")
+    print(f"⏱️ Run deadline: {scheduler.deadline_seconds}s")
     
-    for company, company_data in COMPANY_SOURCES.items():
+    for company in scheduler.iter_companies():
+        company_data = COMPANY_SOURCES[company]
+        if scheduler.request_timeout() is None:
+            scraping_status.set_deferred(company, "Run deadline reached before fetch started")
+            print(f"\n⏭️ Deferred {company}: run deadline reached")
+            continue
+        
         print(f"\n📡 Fetching jobs from {company}...")
-        jobs = fetch_jobs_from_company(company, company_data)
+        jobs = fetch_jobs_from_company(company, company_data, scheduler)
         
         if not jobs:
             continue
@@ -487,7 +809,7 @@ def fetch_jobs():
         print(f"  ✅ {matching_jobs} matching jobs found")
         
         # Add delay between companies
-        time.sleep(random.uniform(1, 3))
+        scheduler.pause(random.uniform(*COMPANY_PAUSE_SECONDS))
     
     print(f"\n📊 Summary:")
     print(f"🆕 New Matching Jobs: {len(new_jobs)}")
@@ -498,17 +820,18 @@ def fetch_jobs():
     print(f"🌐 Scraping Summary:")
     print(f"  ✅ Successful: {summary['successful']}/{summary['total_companies']}")
     print(f"  ❌ Failed: {summary['failed']}/{summary['total_companies']}")
+    print(f"  ⏭️ Deferred: {summary['deferred']}/{summary['total_companies']}")
+    print(f"  ⏱️ Budget left: {round(scheduler.remaining(), 2)}s of {scheduler.deadline_seconds}s")
     print(f"  📊 Total Jobs Found: {summary['total_jobs_found']}")
     
-    save_seen_jobs(new_ids)
-    return new_jobs, current_jobs
+    return new_jobs, current_jobs, new_ids
 
 def group_jobs_by_company(jobs):
-    """Group jobs by company and sort with S&P Global first"""
+    """Group jobs by company and sort by priority (S&P Global first), then name"""
     grouped = {}
     for job in jobs:
         grouped.setdefault(job['company'], []).append(job)
-    return dict(sorted(grouped.items(), key=lambda x: (x[0] != "S&P Global", x[0])))
+    return dict(sorted(grouped.items(), key=lambda x: (-company_priority(x[0]), x[0])))
 
 def format_scraping_status_table():
     """Format scraping status table for email"""
@@ -518,7 +841,7 @@ def format_scraping_status_table():
     <h2>🌐 Scraping Status Report</h2>
     <div style="margin-bottom: 15px;">
         <strong>Overall Status:</strong> {summary['successful']}/{summary['total_companies']} companies successful | 
-        {summary['failed']} failed | {summary['total_jobs_found']} total jobs found
+        {summary['failed']} failed | {summary['deferred']} deferred | {summary['total_jobs_found']} total jobs found
     </div>
     <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%; font-size: 14px;">
         <tr style="background-color: #2196F3; color: white;">
@@ -539,6 +862,9 @@ def format_scraping_status_table():
         elif status['status'] == 'failed':
             row_color = '#FFE8E8'  # Light red
             status_icon = '❌'
+        elif status['status'] == 'deferred':
+            row_color = '#F0F0F0'  # Light grey
+            status_icon = '⏭️'
         else:
             row_color = '#FFF8E1'  # Light yellow
             status_icon = '⏳'
@@ -560,6 +886,66 @@ def format_scraping_status_table():
     html += "</table><br>"
     return html
 
+# Startup metrics filled in while the run gets going
+startup_timings = {'first_request_seconds': None}
+
+def record_first_request():
+    """Record seconds since startup when the first HTTP request goes out"""
+    if startup_timings['first_request_seconds'] is None:
+        startup_timings['first_request_seconds'] = round(time.perf_counter() - IMPORT_START, 3)
+
+def get_startup_summary(sinks, ready_sinks):
+    """Collect import and startup timings for the run summary"""
+    return {
+        'import_seconds': IMPORT_SECONDS,
+        'first_request_seconds': startup_timings['first_request_seconds'],
+        'sinks': {
+            sink.name: {
+                'ready': sink in ready_sinks,
+                'load_seconds': sink.load_time,
+                'check_seconds': sink.check_time,
+                'error': sink.error
+            }
+            for sink in sinks
+        }
+    }
+
+def print_startup_summary(startup):
+    """Print import and startup timings"""
+    print(f"⚙️ Startup Summary:")
+    print(f"  📦 Module imports: {startup['import_seconds']}s")
+    first_request = f"{startup['first_request_seconds']}s" if startup['first_request_seconds'] is not None else "N/A"
+    print(f"  🚦 Time to first request: {first_request}")
+    for name, sink in startup['sinks'].items():
+        if sink['ready']:
+            print(f"  ✅ {name}: load {sink['load_seconds']}s, check {sink['check_seconds']}s")
+        else:
+            print(f"  ❌ {name}: {sink['error']}")
+
+def format_startup_table(startup):
+    """Format startup timings for email"""
+    first_request = f"{startup['first_request_seconds']}s" if startup['first_request_seconds'] is not None else "N/A"
+    rows = []
+    for name, sink in startup['sinks'].items():
+        status = '✅ Ready' if sink['ready'] else f"❌ {sink['error']}"
+        load = f"{sink['load_seconds']}s" if sink['load_seconds'] is not None else "N/A"
+        check = f"{sink['check_seconds']}s" if sink['check_seconds'] is not None else "N/A"
+        rows.append(f"<tr><td>{name}</td><td>{status}</td><td>{load}</td><td>{check}</td></tr>")
+    
+    return f"""
+    <h2>⚙️ Startup Timings</h2>
+    <div style="margin-bottom: 15px;">
+        <strong>Module imports:</strong> {startup['import_seconds']}s |
+        <strong>Time to first request:</strong> {first_request}
+    </div>
+    <table border="1" cellpadding="8" cellspacing="0" style="border-collapse: collapse; width: 100%; font-size: 14px;">
+        <tr style="background-color: #607D8B; color: white;">
+            <th>Sink</th><th>Status</th><th>Import Time</th><th>Credential Check</th>
+        </tr>
+        {''.join(rows)}
+    </table><br>
+    """
+
 def format_summary_table(new_grouped, current_grouped):
     """Format summary table for email"""
     all_companies = set(new_grouped) | set(current_grouped)
@@ -611,20 +997,13 @@ def main():
     print(f"📧 Email sender: {'✅ Set' if EMAIL_SENDER else '❌ Missing'}")
     print(f"🔑 Email password: {'✅ Set' if EMAIL_PASSWORD else '❌ Missing'}")
     print(f"📊 Sheet ID: {'✅ Set' if SHEET_ID else '❌ Missing'}")
+    print(f"💾 JSON output: {'✅ ' + JSON_OUTPUT_FILE if JSON_OUTPUT_FILE else '❌ Disabled'}")
+    print(f"🔔 Webhook: {'✅ Set' if WEBHOOK_URL else '❌ Disabled'}")
     print(f"🐛 Debug mode: {'✅ Enabled' if DEBUG_MODE else '❌ Disabled'}")
     
-    # Test email immediately
-    if EMAIL_SENDER and EMAIL_PASSWORD:
-        print("📧 Testing email configuration...")
-        test_result = send_email(
-            "🧪 Job Bot Test - Enhanced with Scraping Status", 
-            "<p>✅ Email configuration is working! Job bot will start monitoring with scraping status tracking now.</p>"
-        )
-        if not test_result:
-            print("❌ Email test failed - check your Gmail app password")
-            return
-    else:
-        print("❌ Email credentials missing - check environment variables")
+    sinks = get_enabled_sinks()
+    if not sinks:
+        print("❌ No output sinks configured - check environment variables")
         return
     
     # Check for weekly digest mode
@@ -635,8 +1014,33 @@ def main():
             print("⏱️ Skipping — Weekly digest mode enabled, not Monday 10AM IST")
             return
     
-    # Fetch jobs
-    new_jobs, current_jobs = fetch_jobs()
+    # Check sink credentials in the background while fetching. Daemon threads
+    # so a check that never returns can't hold up the process exit.
+    check_deadline = time.monotonic() + SINK_CHECK_TIMEOUT
+    checks = []
+    for sink in sinks:
+        thread = threading.Thread(target=sink.prepare, daemon=True)
+        thread.start()
+        checks.append((sink, thread))
+    
+    new_jobs, current_jobs, new_ids = fetch_jobs()
+    
+    ready_sinks = []
+    for sink, thread in checks:
+        thread.join(timeout=max(0.0, check_deadline - time.monotonic()))
+        if thread.is_alive():
+            sink.error = f"Credential check timed out after {SINK_CHECK_TIMEOUT}s"
+            print(f"❌ {sink.name} sink not ready: {sink.error}")
+        elif sink.ready:
+            ready_sinks.append(sink)
+    
+    startup = get_startup_summary(sinks, ready_sinks)
+    print_startup_summary(startup)
+    
+    if not ready_sinks:
+        print("❌ No output sinks passed their credential check - not saving seen jobs")
+        return
+    
     grouped_new = group_jobs_by_company(new_jobs)
     grouped_current = group_jobs_by_company(current_jobs)
     
@@ -649,6 +1053,7 @@ def main():
     
     # Add scraping status table at the top
     html_body += format_scraping_status_table()
+    html_body += format_startup_table(startup)
     
     html_body += format_summary_table(grouped_new, grouped_current)
     
@@ -677,11 +1082,30 @@ def main():
     </html>
     """
 
-    subject = "📡 Job Alert Summary with Scraping Status"
-    send_email(subject, html_body)
+    report = {
+        'subject': "📡 Job Alert Summary with Scraping Status",
+        'html_body': html_body,
+        'new_jobs': new_jobs,
+        'current_jobs': current_jobs,
+        'summary': scraping_status.get_summary(),
+        'startup': startup,
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+    delivered = dispatch_to_sinks(ready_sinks, report)
 
-    if new_jobs:
-        log_to_sheet(new_jobs)
+    if delivered:
+        print(f"📤 Delivered to: {', '.join(delivered)}")
+    
+    # Only mark jobs as seen once every primary sink (email) has delivered them,
+    # otherwise they would never be alerted on
+    primary = [sink.name for sink in sinks if sink.primary]
+    missing = [name for name in primary if name not in delivered]
+    if missing:
+        print(f"❌ {', '.join(missing)} did not deliver the report - not saving seen jobs")
+    elif not delivered:
+        print("❌ No sink delivered the report - not saving seen jobs")
+    else:
+        save_seen_jobs(new_ids)
 
     print("✅ Job monitoring completed.")
 